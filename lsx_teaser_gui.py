@@ -6,13 +6,30 @@ Profitable sports betting teaser strategy with live odds integration
 import tkinter as tk
 from tkinter import ttk, messagebox
 import json
+import logging
+import time
 import requests
 from typing import Optional, Dict, List, Tuple
 from itertools import combinations
+from collections import OrderedDict
 
 
+logger = logging.getLogger(__name__)
+
 APP_TITLE = "NFL Teaser Builder - LSX Analytics"
 API_BASE_URL = "https://api.the-odds-api.com/v4"
+ODDS_CACHE_SECONDS = 300  # reuse fetched odds for 5 minutes
+ODDS_CACHE_MAX_ENTRIES = 16
+LOW_QUOTA_CALLS = 50  # highlight remaining API calls below this
+
+# Bookmaker titles offered in the filter -> The Odds API bookmaker keys
+BOOKMAKER_KEYS = {
+    "DraftKings": "draftkings",
+    "FanDuel": "fanduel",
+    "BetMGM": "betmgm",
+    "Caesars": "williamhill_us",
+    "PointsBet": "pointsbetus",
+}
 
 
 def american_to_decimal(odds: int) -> float:
@@ -108,6 +125,89 @@ def classify_teaser_leg(spread: float, total: float, prob: float, move_with_us:
     }
 
 
+def new_game(game: str, spread: float, total: float, prob: float,
+             move_with_us: bool, reasons: str) -> Dict:
+    """
+    Build an unfiltered game dict for the candidates table.
+    """
+    return {
+        "game": game,
+        "spread": spread,
+        "total": total,
+        "prob": prob,
+        "move_with_us": move_with_us,
+        "direction": None,
+        "teased_line": None,
+        "qualifies": False,
+        "reasons": reasons
+    }
+
+
+def games_from_odds(data: List[Dict], bookmaker_filter: Optional[str] = None) -> List[Dict]:
+    """
+    Turn an Odds API event list into one game dict per spread outcome.
+
+    Uses the bookmaker titled bookmaker_filter when present, else the first
+    bookmaker listed. Events missing a spreads or totals market are skipped.
+    """
+    games = []
+    append = games.append
+
+    for event in data:
+        bookmakers = event.get("bookmakers")
+        if not bookmakers:
+            continue
+
+        # Select bookmaker
+        chosen_book = None
+        if bookmaker_filter:
+            chosen_book = next((bm for bm in bookmakers if bm.get("title") == bookmaker_filter), None)
+        if chosen_book is None:
+            chosen_book = bookmakers[0]
+
+        markets = {m.get("key"): m for m in chosen_book.get("markets", [])}
+        spreads_market = markets.get("spreads")
+        totals_market = markets.get("totals")
+
+        if spreads_market is None or totals_market is None:
+            continue
+
+        # Same total applies to both sides of the game
+        total_point = None
+        if totals_market.get("outcomes"):
+            total_point = totals_market["outcomes"][0].get("point")
+        total_val = float(total_point) if total_point is not None else 47.0
+
+        home = event.get("home_team", "HOME")
+        away = event.get("away_team", "AWAY")
+
+        # Create entries for each spread outcome
+        for outcome in spreads_market.get("outcomes", []):
+            point = outcome.get("point")
+            if point is None:
+                continue
+
+            team = outcome.get("name", "Team")
+            if team == home:
+                matchup = f"{team} vs {away}"
+            else:
+                matchup = f"{team} @ {home}"
+
+            # Default probability - YOU SHOULD UPDATE THIS WITH YOUR MODEL
+            prob = 0.75
+
+            append(new_game(
+                matchup,
+                float(point),
+                total_val,
+                prob,
+                True,  # Default to market moving with us
+                "Imported from API - run LSX filters"
+            ))
+
+    return games
+
+
 class TeaserApp:
     def __init__(self, root):
         self.root = root
@@ -120,6 +220,10 @@ class TeaserApp:
 
         self.games = []  # list of game dicts
 
+        # Reused across fetches so the TLS connection to the API is kept alive
+        self.session = requests.Session()
+        self._odds_cache = OrderedDict()  # request params -> (data, fetched_at), oldest first
+
         self._build_widgets()
 
     def _build_widgets(self):
@@ -247,6 +351,10 @@ class TeaserApp:
         self.tree.column("qualifies", width=80, anchor="center")
         self.tree.column("reasons", width=450, anchor="w")
 
+        # Tag colors
+        self.tree.tag_configure("qualified", background="#d4edda")
+        self.tree.tag_configure("not_qualified", background="#f8d7da")
+
         # Scrollbars
         vsb = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
         hsb = ttk.Scrollbar(table_frame, orient="horizontal", command=self.tree.xview)
@@ -359,17 +467,7 @@ class TeaserApp:
             messagebox.showerror("Input Error", f"Invalid input: {e}")
             return
 
-        game_dict = {
-            "game": game,
-            "spread": spread,
-            "total": total,
-            "prob": prob,
-            "move_with_us": move_with_us,
-            "direction": None,
-            "teased_line": None,
-            "qualifies": False,
-            "reasons": "Not yet filtered"
-        }
+        game_dict = new_game(game, spread, total, prob, move_with_us, "Not yet filtered")
 
         # Update if exists, else append
         for idx, g in enumerate(self.games):
@@ -385,8 +483,7 @@ class TeaserApp:
     def refresh_table(self):
         """Refresh the treeview table"""
         # Clear existing
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.tree.delete(*self.tree.get_children())
 
         # Re-populate
         for g in self.games:
@@ -415,10 +512,6 @@ class TeaserApp:
                 tags=tags
             )
 
-        # Tag colors
-        self.tree.tag_configure("qualified", background="#d4edda")
-        self.tree.tag_configure("not_qualified", background="#f8d7da")
-
     def run_filters(self):
         """Apply LSX teaser filters to all games"""
         if not self.games:
@@ -455,7 +548,7 @@ class TeaserApp:
             dec = american_to_decimal(odds)
             profit_per_unit = dec - 1.0
             be = break_even_prob(odds)
-        except Exception as e:
+        except ValueError as e:
             messagebox.showerror("Invalid Odds", f"Could not parse teaser odds: {e}")
             return
 
@@ -595,45 +688,21 @@ class TeaserApp:
                 f"Recommendation: PASS this week."
             )
 
-    def fetch_odds(self):
+    def _request_odds(self, url: str, params: Dict) -> Optional[List[Dict]]:
         """
-        Fetch live NFL odds from The Odds API
+        Request odds from The Odds API.
+        Shows an error dialog and returns None on failure.
         """
-        # Get and validate API key
-        api_key_raw = self.entry_api_key.get()
-        api_key = api_key_raw.strip()
-
-        # Debug output
-        print(f"[DEBUG] API key length: {len(api_key)}")
-        print(f"[DEBUG] API key first 10 chars: {api_key[:10] if len(api_key) >= 10 else api_key}")
-
-        if not api_key or len(api_key) < 10:
-            messagebox.showerror(
-                "API Key Required",
-                "Please enter your API key from The Odds API.\n\n"
-                "Get a free key at: https://the-odds-api.com/"
-            )
-            return
-
-        bookmaker_filter = self.entry_bookmaker.get().strip() or None
-
-        # API request
-        url = f"{API_BASE_URL}/sports/americanfootball_nfl/odds"
-        params = {
-            "regions": "us",
-            "markets": "spreads,totals",
-            "oddsFormat": "american",
-            "apiKey": api_key
-        }
-
         try:
-            print(f"[DEBUG] Fetching from: {url}")
-            print(f"[DEBUG] Params: {params}")
+            logger.debug(
+                "Fetching %s (markets=%s, bookmakers=%s)",
+                url, params.get("markets"), params.get("bookmakers", "all")
+            )
 
             self.btn_fetch_odds.config(state="disabled", text="Fetching...")
             self.root.update()
 
-            resp = requests.get(url, params=params, timeout=15)
+            resp = self.session.get(url, params=params, timeout=15)
 
             # Check for API errors
             if resp.status_code == 401:
@@ -641,29 +710,36 @@ class TeaserApp:
                     "Unauthorized",
                     "Invalid API key (401).\n\nCheck that your key is correct and active."
                 )
-                return
+                return None
             elif resp.status_code == 429:
                 messagebox.showerror(
                     "Rate Limited",
                     "Too many requests (429).\n\nYou've exceeded your API quota."
                 )
-                return
+                return None
 
             resp.raise_for_status()
 
             # Check remaining requests
             requests_remaining = resp.headers.get('x-requests-remaining', 'Unknown')
             requests_used = resp.headers.get('x-requests-used', 'Unknown')
+            try:
+                low_quota = int(requests_remaining) < LOW_QUOTA_CALLS
+            except ValueError:
+                low_quota = False
             self.lbl_api_usage.config(
-                text=f"API calls remaining: {requests_remaining} (used: {requests_used})"
+                text=f"API calls remaining: {requests_remaining} (used: {requests_used})",
+                foreground="red" if low_quota else ""
             )
+            if low_quota:
+                logger.warning("Only %s Odds API calls remaining", requests_remaining)
 
         except requests.exceptions.Timeout:
             messagebox.showerror("Timeout", "Request timed out. Check your internet connection.")
-            return
+            return None
         except requests.exceptions.RequestException as e:
             messagebox.showerror("Network Error", f"Failed to fetch odds:\n{e}")
-            return
+            return None
         finally:
             self.btn_fetch_odds.config(state="normal", text="Fetch NFL Odds")
 
@@ -672,87 +748,63 @@ class TeaserApp:
             data = resp.json()
         except json.JSONDecodeError as e:
             messagebox.showerror("Parse Error", f"Could not parse API response:\n{e}")
-            return
+            return None
 
         if not isinstance(data, list):
             messagebox.showerror("Unexpected Response", f"API returned unexpected format:\n{data}")
-            return
+            return None
 
-        # Process games
-        imported = 0
-        self.games = []  # Reset list
+        return data
 
-        for event in data:
-            home = event.get("home_team", "HOME")
-            away = event.get("away_team", "AWAY")
+    def fetch_odds(self):
+        """
+        Fetch live NFL odds from The Odds API
+        """
+        # Get and validate API key
+        api_key_raw = self.entry_api_key.get()
+        api_key = api_key_raw.strip()
 
-            bookmakers = event.get("bookmakers", [])
-            if not bookmakers:
-                continue
+        logger.debug("API key length: %d", len(api_key))
 
-            # Select bookmaker
-            chosen_book = None
-            if bookmaker_filter:
-                for bm in bookmakers:
-                    if bm.get("title") == bookmaker_filter:
-                        chosen_book = bm
-                        break
-            if chosen_book is None:
-                chosen_book = bookmakers[0]
-
-            markets = chosen_book.get("markets", [])
-            spreads_market = None
-            totals_market = None
-
-            for m in markets:
-                if m.get("key") == "spreads":
-                    spreads_market = m
-                elif m.get("key") == "totals":
-                    totals_market = m
-
-            if spreads_market is None or totals_market is None:
-                continue
+        if not api_key or len(api_key) < 10:
+            messagebox.showerror(
+                "API Key Required",
+                "Please enter your API key from The Odds API.\n\n"
+                "Get a free key at: https://the-odds-api.com/"
+            )
+            return
 
-            # Get total
-            total_point = None
-            if totals_market.get("outcomes"):
-                total_point = totals_market["outcomes"][0].get("point")
-
-            # Create entries for each spread outcome
-            for outcome in spreads_market.get("outcomes", []):
-                team = outcome.get("name", "Team")
-                point = outcome.get("point")
-                if point is None:
-                    continue
-
-                spread = float(point)
-                total_val = float(total_point) if total_point is not None else 47.0
-
-                # Determine matchup label
-                if team == home:
-                    opponent = away
-                    matchup = f"{team} vs {opponent}"
-                else:
-                    opponent = home
-                    matchup = f"{team} @ {opponent}"
-
-                # Default probability - YOU SHOULD UPDATE THIS WITH YOUR MODEL
-                prob = 0.75
-
-                game_dict = {
-                    "game": matchup,
-                    "spread": spread,
-                    "total": total_val,
-                    "prob": prob,
-                    "move_with_us": True,  # Default to true
-                    "direction": None,
-                    "teased_line": None,
-                    "qualifies": False,
-                    "reasons": "Imported from API - run LSX filters"
-                }
-
-                self.games.append(game_dict)
-                imported += 1
+        bookmaker_filter = self.entry_bookmaker.get().strip() or None
+
+        # API request
+        url = f"{API_BASE_URL}/sports/americanfootball_nfl/odds"
+        params = {
+            "regions": "us",
+            "markets": "spreads,totals",
+            "oddsFormat": "american",
+            "apiKey": api_key
+        }
+        # Let the API drop other books instead of downloading and discarding them
+        if bookmaker_filter in BOOKMAKER_KEYS:
+            params["bookmakers"] = BOOKMAKER_KEYS[bookmaker_filter]
+
+        # Reuse a recent response for the same request to save API calls
+        cache_key = tuple(sorted(params.items()))
+        cached = self._odds_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[1] < ODDS_CACHE_SECONDS:
+            data = cached[0]
+            self._odds_cache.move_to_end(cache_key)
+        else:
+            data = self._request_odds(url, params)
+            if data is None:
+                return
+            self._odds_cache[cache_key] = (data, time.monotonic())
+            self._odds_cache.move_to_end(cache_key)
+            if len(self._odds_cache) > ODDS_CACHE_MAX_ENTRIES:
+                self._odds_cache.popitem(last=False)
+
+        self.games = games_from_odds(data, bookmaker_filter)
+        imported = len(self.games)
 
         self.refresh_table()
 
@@ -770,7 +822,7 @@ class TeaserApp:
             dec = american_to_decimal(odds)
             profit_per_unit = dec - 1.0
             be = break_even_prob(odds)
-        except Exception as e:
+        except ValueError as e:
             messagebox.showerror("Invalid Odds", f"Could not parse teaser odds: {e}")
             return
 
@@ -845,6 +897,7 @@ class TeaserApp:
 
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     root = tk.Tk()
     app = TeaserApp(root)
     root.mainloop()